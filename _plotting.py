@@ -0,0 +1,57 @@
+"""Shared CSV loading and aggregation for the dashboard entrypoints.
+
+Both app.py (Streamlit) and plot_results.py (CLI) need the same results
+frame and the same per-(HostCount, Algorithm) means; keeping the load and
+aggregation here means one parse and one groupby pass serve every caller.
+"""
+
+import functools
+import os
+
+import pandas as pd
+
+# Compact dtypes for the columns the dashboards use: float32 halves the
+# metric footprint, category makes groupby keys int-coded
+CSV_DTYPES = {
+    'HostCount': 'int32',
+    'Run': 'int32',
+    'Algorithm': 'category',
+    'BestFitness': 'float32',
+    'Power': 'float32',
+    'Load': 'float32',
+    'Network': 'float32',
+    'Link': 'float32'
+}
+
+METRICS = ['BestFitness', 'Power', 'Load', 'Network', 'Link']
+
+# Preferred legend/report order; labels not listed here keep their spot after
+ALGO_ORDER = ['Hybrid ACO-PSO', 'ACO', 'PSO']
+
+@functools.lru_cache(maxsize=1)
+def load_clean_df(path, mtime):
+    """Loads the results CSV with compact dtypes; 'FAILED' becomes NaN
+    inside the C parser so no cleanup pass is needed. Memoized on
+    (path, mtime) so repeated callers share a single parse."""
+    df = pd.read_csv(path, usecols=lambda c: c in CSV_DTYPES,
+                     dtype=CSV_DTYPES, na_values=['FAILED', '', 'NaN'])
+    if 'Algorithm' in df.columns:
+        # An ordered categorical groups on int8 codes instead of hashing
+        # strings, and keeps the legend order stable downstream
+        observed = list(df['Algorithm'].cat.categories)
+        ordered = ([a for a in ALGO_ORDER if a in observed] +
+                   [a for a in observed if a not in ALGO_ORDER])
+        df['Algorithm'] = df['Algorithm'].cat.set_categories(ordered, ordered=True)
+    return df
+
+def load_results(path):
+    """Convenience wrapper keying the cache on the file's current mtime."""
+    if not os.path.exists(path):
+        return None
+    return load_clean_df(path, os.path.getmtime(path))
+
+def agg_by_host_algo(df):
+    """Mean of every available metric per (HostCount, Algorithm) in one
+    fused groupby pass; callers slice the columns they need."""
+    metrics = [m for m in METRICS if m in df.columns]
+    return df.groupby(['HostCount', 'Algorithm'], sort=False, observed=True)[metrics].mean()
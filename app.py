@@ -1,9 +1,20 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
+import numpy as np
 import plotly.graph_objects as go
 import os
 
+import _plotting
+import plot_results
+
+# Route large elementwise frame arithmetic through numexpr when the
+# optional dependency is installed (chunked + multithreaded); no-op otherwise
+try:
+    import numexpr  # noqa: F401
+    pd.set_option('compute.use_numexpr', True)
+except ImportError:
+    pass
+
 # --- 1. CONFIGURATION ---
 st.set_page_config(
     page_title="Hybrid Optimization Results",
@@ -35,19 +46,58 @@ CSV_FILE = "results.csv"
 # --- 2. DATA LOADING ---
 @st.cache_data
 def load_data():
-    if not os.path.exists(CSV_FILE):
-        return None
-    df = pd.read_csv(CSV_FILE)
-
-    # Clean numeric columns (handle 'FAILED' text)
-    cols_to_clean = ['BestFitness', 'Power', 'Load', 'Network', 'Link']
-    for col in cols_to_clean:
-        if col in df.columns:
-            df[col] = pd.to_numeric(df[col], errors='coerce')
-    return df
+    # Column selection, dtypes and 'FAILED' handling live in _plotting,
+    # shared with the CLI plot script
+    return _plotting.load_results(CSV_FILE)
 
 df = load_data()
 
+METRICS = _plotting.METRICS
+
+# Cached aggregations keyed on the selected hosts, so repeated sidebar
+# selections skip the pandas pass entirely on rerun
+@st.cache_data
+def agg_by_algo(hosts: tuple) -> pd.DataFrame:
+    return (df[df['HostCount'].isin(hosts)]
+            .groupby('Algorithm', sort=False, observed=True)[METRICS].mean())
+
+# Cap on datapoints sent to the browser per line trace
+MAX_CHART_POINTS = 1000
+
+def lttb_downsample(xs, ys, n_out=MAX_CHART_POINTS):
+    """Largest-Triangle-Three-Buckets: keeps at most n_out visually
+    representative points of a line series (no-op for short series)."""
+    xs = np.asarray(xs, dtype=float)
+    ys = np.asarray(ys, dtype=float)
+    n = len(xs)
+    if n <= n_out:
+        return xs, ys
+
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    keep = [0]
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], max(edges[i + 1], edges[i] + 1)
+        # Anchor the triangle on the average of the following bucket
+        nxt_hi = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = xs[hi:nxt_hi].mean() if nxt_hi > hi else xs[-1]
+        avg_y = ys[hi:nxt_hi].mean() if nxt_hi > hi else ys[-1]
+        bx, by = xs[lo:hi], ys[lo:hi]
+        areas = np.abs((xs[a] - avg_x) * (by - ys[a]) - (xs[a] - bx) * (avg_y - ys[a]))
+        a = lo + int(np.nanargmax(areas)) if np.isfinite(areas).any() else lo
+        keep.append(a)
+    keep.append(n - 1)
+    return xs[keep], ys[keep]
+
+@st.cache_data
+def agg_by_host_algo(hosts: tuple) -> pd.DataFrame:
+    # One fused multi-metric groupby instead of one scan per chart;
+    # callers slice the columns they need from the result. sort_values
+    # keeps hosts ascending (the CSV is appended to, so groupby's
+    # sort=False would yield appearance order and zig-zag line charts).
+    return (_plotting.agg_by_host_algo(df[df['HostCount'].isin(hosts)])
+            .reset_index().sort_values('HostCount'))
+
 # --- 3. MAIN DASHBOARD ---
 if df is None or df.empty:
     st.error("Results file not found. Please run your Java simulation first!")
@@ -57,20 +107,26 @@ if df is None or df.empty:
 st.sidebar.title("Analysis Controls")
 all_hosts = sorted(df['HostCount'].unique())
 selected_hosts = st.sidebar.multiselect("Select Scenarios (Hosts):", all_hosts, default=all_hosts)
+fast_mode = st.sidebar.checkbox(
+    "Fast mode (static chart)",
+    help="Show the pre-rendered Matplotlib dashboard instead of interactive charts."
+)
 
 if not selected_hosts:
     st.warning("Select at least one scenario.")
     st.stop()
 
-# Filter Data
-filtered_df = df[df['HostCount'].isin(selected_hosts)]
+# Filter Data (skip the mask pass when every scenario is selected,
+# which is the default state on page load)
+hosts_key = tuple(sorted(selected_hosts))  # lists aren't hashable for st.cache_data
+filtered_df = df if set(selected_hosts) == set(all_hosts) else df[df['HostCount'].isin(selected_hosts)]
 
 # --- SECTION 1: THE VERDICT (Executive Summary) ---
 st.title("Hybrid Algorithm Performance Report")
 st.markdown("### Executive Summary")
 
 # Calculate Averages for the selected scenarios
-avg_stats = filtered_df.groupby('Algorithm')[['BestFitness', 'Power', 'Load', 'Network', 'Link']].mean()
+avg_stats = agg_by_algo(hosts_key)
 
 if 'Hybrid ACO-PSO' in avg_stats.index:
     hybrid_fit = avg_stats.loc['Hybrid ACO-PSO', 'BestFitness']
@@ -105,8 +161,11 @@ if 'Hybrid ACO-PSO' in avg_stats.index:
             </div>
             """, unsafe_allow_html=True)
         with col3:
-            success_rate = (filtered_df[filtered_df['Algorithm'] == 'Hybrid ACO-PSO']['BestFitness'].notna().sum() /
-                            len(filtered_df[filtered_df['Algorithm'] == 'Hybrid ACO-PSO'])) * 100
+            # Single boolean mask over raw NumPy arrays instead of
+            # materializing the hybrid subframe twice
+            hybrid_mask = filtered_df['Algorithm'].values == 'Hybrid ACO-PSO'
+            hybrid_fitness = filtered_df['BestFitness'].values[hybrid_mask]
+            success_rate = np.isfinite(hybrid_fitness).mean() * 100
             st.markdown(f"""
             <div class="stat-card">
                 <div class="stat-label">Hybrid Reliability</div>
@@ -119,63 +178,97 @@ if 'Hybrid ACO-PSO' in avg_stats.index:
 st.markdown("---")
 st.subheader("Performance Analysis")
 
-tab1, tab2 = st.tabs(["Fitness & Power ", "Trade-off Details "])
+if fast_mode:
+    # Serve the pre-rendered Matplotlib PNG: no Plotly figure
+    # serialization and no client-side chart layout work at all
+    st.caption("Static dashboard rendered from the full results file.")
+    stat = os.stat(CSV_FILE)
+    st.image(plot_results.build_dashboard_png(stat.st_mtime, stat.st_size),
+             use_container_width=True)
+else:
+    tab1, tab2 = st.tabs(["Fitness & Power ", "Trade-off Details "])
 
-with tab1:
-    st.caption("Lower bars are better.")
-    metric = st.radio("Select Metric:", ["BestFitness", "Power"], horizontal=True)
+    with tab1:
+        st.caption("Lower bars are better.")
+        metric = st.radio("Select Metric:", ["BestFitness", "Power"], horizontal=True)
 
-    # Prepare Data
-    chart_df = filtered_df.groupby(['HostCount', 'Algorithm'])[metric].mean().reset_index()
+        # Prepare Data
+        chart_df = agg_by_host_algo(hosts_key)[['HostCount', 'Algorithm', metric]]
 
-    # Explicit Colors: Hybrid is Green (Good), Others neutral/alert
-    color_map = {
-        'Hybrid ACO-PSO': '#2ecc71', # Green
-        'ACO': '#3498db',          # Blue
-        'PSO': '#e74c3c'           # Red
-    }
+        # Explicit Colors: Hybrid is Green (Good), Others neutral/alert
+        color_map = {
+            'Hybrid ACO-PSO': '#2ecc71', # Green
+            'ACO': '#3498db',          # Blue
+            'PSO': '#e74c3c'           # Red
+        }
 
-    fig = px.bar(
-        chart_df, x="HostCount", y=metric, color="Algorithm", barmode="group",
-        color_discrete_map=color_map, text_auto='.2s',
-        title=f"Average {metric} by Scenario Difficulty"
-    )
-    fig.update_layout(yaxis_title=metric, xaxis_title="Hosts (Scenario Difficulty)", plot_bgcolor="white")
-    st.plotly_chart(fig, use_container_width=True)
+        # Build one trace per algorithm directly (px.bar would re-group the
+        # already-aggregated frame internally on every rerun)
+        fig = go.Figure()
+        for algo in chart_df['Algorithm'].unique():
+            sub = chart_df.loc[chart_df['Algorithm'] == algo]
+            fig.add_bar(x=sub['HostCount'], y=sub[metric], name=algo,
+                        marker_color=color_map.get(algo),
+                        text=sub[metric], texttemplate='%{text:.2s}')
+        fig.update_layout(
+            barmode="group", title=f"Average {metric} by Scenario Difficulty",
+            yaxis_title=metric, xaxis_title="Hosts (Scenario Difficulty)",
+            legend_title_text="Algorithm", plot_bgcolor="white"
+        )
+        st.plotly_chart(fig, use_container_width=True)
+
+    with tab2:
+        st.write("**Why does the Hybrid win?**")
+        st.write("The Hybrid algorithm intelligently sacrifices a small amount of Load Balancing to achieve massive Power Savings.")
+
+        # Side-by-side comparison of Load vs Power
+        col_a, col_b = st.columns(2)
 
-with tab2:
-    st.write("**Why does the Hybrid win?**")
-    st.write("The Hybrid algorithm intelligently sacrifices a small amount of Load Balancing to achieve massive Power Savings.")
+        grouped = agg_by_host_algo(hosts_key)
 
-    # Side-by-side comparison of Load vs Power
-    col_a, col_b = st.columns(2)
+        # Slice each algorithm once, reuse for both line charts
+        algo_frames = {algo: grouped.loc[grouped['Algorithm'] == algo]
+                       for algo in grouped['Algorithm'].unique()}
 
-    # Power Chart
-    power_df = filtered_df.groupby(['HostCount', 'Algorithm'])['Power'].mean().reset_index()
-    fig_p = px.line(power_df, x="HostCount", y="Power", color="Algorithm", markers=True,
-                    color_discrete_map=color_map, title="1. Power Consumption (Lower is Better)")
-    col_a.plotly_chart(fig_p, use_container_width=True)
+        # Power Chart
+        fig_p = go.Figure()
+        for algo, sub in algo_frames.items():
+            ds_x, ds_y = lttb_downsample(sub['HostCount'], sub['Power'])
+            fig_p.add_trace(go.Scatter(x=ds_x, y=ds_y, name=algo,
+                                       mode='lines+markers', line_color=color_map.get(algo)))
+        fig_p.update_layout(title="1. Power Consumption (Lower is Better)",
+                            xaxis_title="HostCount", yaxis_title="Power",
+                            legend_title_text="Algorithm")
+        col_a.plotly_chart(fig_p, use_container_width=True)
 
-    # Load Chart
-    load_df = filtered_df.groupby(['HostCount', 'Algorithm'])['Load'].mean().reset_index()
-    fig_l = px.line(load_df, x="HostCount", y="Load", color="Algorithm", markers=True,
-                    color_discrete_map=color_map, title="2. Load Imbalance (Lower is Better)")
-    col_b.plotly_chart(fig_l, use_container_width=True)
+        # Load Chart
+        fig_l = go.Figure()
+        for algo, sub in algo_frames.items():
+            ds_x, ds_y = lttb_downsample(sub['HostCount'], sub['Load'])
+            fig_l.add_trace(go.Scatter(x=ds_x, y=ds_y, name=algo,
+                                       mode='lines+markers', line_color=color_map.get(algo)))
+        fig_l.update_layout(title="2. Load Imbalance (Lower is Better)",
+                            xaxis_title="HostCount", yaxis_title="Load",
+                            legend_title_text="Algorithm")
+        col_b.plotly_chart(fig_l, use_container_width=True)
 
-    st.info("Notice in Chart 1 (Power), the **Green Line (Hybrid)** is much lower than Blue (ACO). "
-            "In Chart 2 (Load), the Green line is slightly higher. "
-            "This proves the Hybrid found a **smarter trade-off** to minimize the total Fitness score.")
+        st.info("Notice in Chart 1 (Power), the **Green Line (Hybrid)** is much lower than Blue (ACO). "
+                "In Chart 2 (Load), the Green line is slightly higher. "
+                "This proves the Hybrid found a **smarter trade-off** to minimize the total Fitness score.")
 
 # --- SECTION 3: RAW DATA ---
 st.markdown("---")
 with st.expander("View Raw Data Table"):
+    # column_config formats in the browser; Styler would format every
+    # cell in Python on each rerun
     st.dataframe(
-        filtered_df.style.format({
-            'BestFitness': '{:,.0f}',
-            'Power': '{:,.2f}',
-            'Load': '{:.4f}',
-            'Network': '{:,.0f}',
-            'Link': '{:.4f}'
-        }),
+        filtered_df,
+        column_config={
+            'BestFitness': st.column_config.NumberColumn(format='%,.0f'),
+            'Power': st.column_config.NumberColumn(format='%,.2f'),
+            'Load': st.column_config.NumberColumn(format='%.4f'),
+            'Network': st.column_config.NumberColumn(format='%,.0f'),
+            'Link': st.column_config.NumberColumn(format='%.4f')
+        },
         use_container_width=True
     )